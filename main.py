@@ -1,435 +1,890 @@
-import os
-import fitz  # PyMuPDF for PDF processing
-from fastapi import FastAPI, UploadFile, HTTPException
-from dotenv import load_dotenv
-from diffusers import StableDiffusionXLPipeline
-from elevenlabs import generate
-import requests
-from pptx import Presentation
-import uvicorn
-from huggingface_hub import login
-import ollama
-import logging
-from fpdf import FPDF
-import torch
-from datetime import datetime
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("app.log"), logging.StreamHandler()]
-)
-
-# Load environment variables
-load_dotenv()
-
-# Create a directory for temporary files
-TEMP_DIR = "temp_files"
-os.makedirs(TEMP_DIR, exist_ok=True)
-
-# Get API keys securely
-ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
-HUGGINGFACE_API_TOKEN = os.getenv("HUGGINGFACE_API_TOKEN")
-
-# Ensure API keys are set
-if not ELEVENLABS_API_KEY or not HUGGINGFACE_API_TOKEN:
-    logging.error("API keys are not set correctly.")
-    raise ValueError("API keys are missing.")
-
-# Authenticate with Hugging Face Hub
-login(token=HUGGINGFACE_API_TOKEN)
-
-class SummaryPDF(FPDF):
-    def header(self):
-        self.set_font('Arial', 'B', 15)
-        self.cell(0, 10, 'Research Paper Summary', 0, 1, 'C')
-        self.ln(10)
-        
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 10, f'Generated on {datetime.now().strftime("%Y-%m-%d %H:%M")} - Page {self.page_no()}', 0, 0, 'C')
-
-app = FastAPI()
-
-def initialize_stable_diffusion():
-    """Initialize Stable Diffusion with optimal settings"""
-    try:
-        # Check if CUDA is available
-        if not torch.cuda.is_available():
-            raise RuntimeError("CUDA is not available. Please ensure you have a CUDA-capable GPU.")
-        
-        # Initialize the pipeline with proper settings
-        pipe = StableDiffusionXLPipeline.from_pretrained(
-            "stabilityai/stable-diffusion-xl-base-1.0",
-            torch_dtype=torch.float16,  # Ensure float16 for memory efficiency
-            use_safetensors=True,
-            variant="fp16"
-        )
-        
-        # Move to CUDA device
-        pipe = pipe.to("cuda")
-        
-        # Optional memory optimizations based on available GPU memory
-        if torch.cuda.get_device_properties(0).total_memory >= 8 * (1024 ** 3):  # 8GB or more
-            try:
-                pipe.enable_xformers_memory_efficient_attention()
-            except Exception as e:
-                logging.warning(f"Could not enable xformers: {e}")
-                # Fallback to standard attention mechanism
-                pipe.enable_attention_slicing()
-        else:
-            # For GPUs with less memory, use these optimizations
-            pipe.enable_attention_slicing()
-            pipe.enable_sequential_cpu_offload()
-        
-        return pipe
-    except Exception as e:
-        logging.error(f"Error initializing Stable Diffusion: {str(e)}")
-        # Provide more specific error messages based on common issues
-        if "CUDA" in str(e):
-            raise HTTPException(
-                status_code=500,
-                detail="GPU initialization failed. Please ensure CUDA is properly installed and a compatible GPU is available."
-            )
-        elif "memory" in str(e).lower():
-            raise HTTPException(
-                status_code=500,
-                detail="Insufficient GPU memory. Try reducing batch size or image dimensions."
-            )
-        else:
-            raise HTTPException(status_code=500, detail=f"Failed to initialize Stable Diffusion: {str(e)}")
-
-def generate_graphical_abstract(summary, pipe):
-    try:
-        # Create a more focused prompt for research visualization
-        prompt = f"""Create a scientific graphical abstract visualization:
-        A clean, professional diagram showing:
-        {summary[:300]}
-        Style: Modern scientific illustration, minimalist, clear layout, professional colors
-        Include: Relevant scientific symbols, data visualization elements, and clear visual hierarchy
-        """
-        
-        negative_prompt = "text, words, blurry, low quality, distorted, messy, cluttered"
-        
-        # Generate image with improved parameters and error handling
-        try:
-            output = pipe(
-                prompt=prompt,
-                negative_prompt=negative_prompt,
-                num_inference_steps=30,  # Reduced steps for better performance
-                guidance_scale=7.5,
-                height=512,  # Reduced size for memory efficiency
-                width=512,
-                generator=torch.manual_seed(42)  # For reproducibility
-            )
-        except torch.cuda.OutOfMemoryError:
-            # Fallback to smaller image size if OOM error occurs
-            output = pipe(
-                prompt=prompt,
-                negative_prompt=negative_prompt,
-                num_inference_steps=20,
-                guidance_scale=7.5,
-                height=384,
-                width=384,
-                generator=torch.manual_seed(42)
-            )
-        
-        if not output.images:
-            raise ValueError("No images generated")
-            
-        image = output.images[0]
-        graphical_abstract_path = os.path.join(TEMP_DIR, "graphical_abstract.png")
-        image.save(graphical_abstract_path, quality=95)
-        
-        return graphical_abstract_path
-    except Exception as e:
-        logging.error(f"Graphical Abstract Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to generate graphical abstract: {str(e)}")
-
-@app.get("/")
-def read_root():
-    return {"message": "FastAPI server is running!"}
-
-# Extract text from PDF
-def extract_text_from_pdf(pdf_path):
-    try:
-        with fitz.open(pdf_path) as doc:
-            return "".join(page.get_text("text") for page in doc)
-    except Exception as e:
-        logging.error(f"PDF Extraction Error: {str(e)}")
-        raise HTTPException(status_code=400, detail=f"PDF Extraction Error: {str(e)}")
-
-# Ollama Summary
-def ollama_summary(text, summary_length="medium"):
-    try:
-        response = ollama.generate(
-            model="llama2",
-            prompt=f"Summarize the following research paper in {summary_length} length, providing key findings, methodology, conclusions, and implications: {text}",
-            options={"max_tokens": 1000}
-        )
-        logging.info("Ollama summary generated successfully.")
-        return response["response"] if "response" in response else ""
-    except Exception as e:
-        logging.error(f"Ollama Summary Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Ollama Summary Error: {str(e)}")
-
-def format_summary_sections(summary):
-    """Format the summary into structured sections with improved parsing"""
-    sections = {
-        "Key Findings": [],
-        "Methodology": [],
-        "Conclusions": [],
-        "Implications": []
-    }
-    
-    try:
-        # Modify the prompt to get more structured output
-        categorized = ollama.generate(
-            model="llama2",
-            prompt=f"""Please analyze this summary and provide a detailed breakdown in the following format:
-
-KEY FINDINGS:
-- First key finding
-- Second key finding
-(etc.)
-
-METHODOLOGY:
-- First methodological point
-- Second methodological point
-(etc.)
-
-CONCLUSIONS:
-- First conclusion
-- Second conclusion
-(etc.)
-
-IMPLICATIONS:
-- First implication
-- Second implication
-(etc.)
-
-Summary to analyze: {summary}""",
-            options={"max_tokens": 2000}
-        )
-        
-        # Improved parsing logic
-        current_section = None
-        response_lines = categorized["response"].split('\n')
-        
-        for line in response_lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Check for section headers
-            upper_line = line.upper()
-            if "KEY FINDINGS:" in upper_line:
-                current_section = "Key Findings"
-            elif "METHODOLOGY:" in upper_line:
-                current_section = "Methodology"
-            elif "CONCLUSIONS:" in upper_line:
-                current_section = "Conclusions"
-            elif "IMPLICATIONS:" in upper_line:
-                current_section = "Implications"
-            # Add content if we're in a section and the line starts with a bullet point or dash
-            elif current_section and (line.startswith('-') or line.startswith('•')):
-                # Remove the bullet point/dash and clean up the text
-                content = line.lstrip('- •').strip()
-                if content:  # Only add non-empty content
-                    sections[current_section].append(content)
-                    
-        # Ensure each section has at least some content
-        for section in sections:
-            if not sections[section]:
-                # Generate specific content for empty sections
-                section_content = ollama.generate(
-                    model="llama2",
-                    prompt=f"Based on this summary, provide 2-3 points specifically for the {section} section: {summary}",
-                    options={"max_tokens": 500}
-                )
-                # Parse the response and add points
-                for line in section_content["response"].split('\n'):
-                    line = line.strip()
-                    if line and not line.upper().endswith(':'):
-                        sections[section].append(line.lstrip('- •'))
-    
-    except Exception as e:
-        logging.error(f"Error in format_summary_sections: {str(e)}")
-        # Fallback: generate content for each section independently
-        for section in sections:
-            try:
-                section_content = ollama.generate(
-                    model="llama2",
-                    prompt=f"Provide 2-3 key points for the {section} section based on this summary: {summary}",
-                    options={"max_tokens": 500}
-                )
-                # Parse the response and add points
-                for line in section_content["response"].split('\n'):
-                    line = line.strip()
-                    if line and not line.upper().endswith(':'):
-                        sections[section].append(line.lstrip('- •'))
-            except:
-                sections[section].append("Content generation failed for this section")
-    
-    return sections
-
-class SummaryPDF(FPDF):
-    def header(self):
-        self.set_font('Arial', 'B', 15)
-        self.cell(0, 10, 'Research Paper Summary', 0, 1, 'C')
-        self.ln(10)
-        
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 10, f'Generated on {datetime.now().strftime("%Y-%m-%d %H:%M")} - Page {self.page_no()}', 0, 0, 'C')
-
-def save_summary_to_pdf(summary, output_path):
-    try:
-        pdf = SummaryPDF()
-        pdf.add_page()
-        
-        # Format the summary into sections
-        sections = format_summary_sections(summary)
-        
-        # Add formatted content using standard dash
-        for section, points in sections.items():
-            # Section header
-            pdf.set_font('Arial', 'B', 14)
-            pdf.cell(0, 10, section, ln=True)
-            pdf.ln(5)
-            
-            # Section content
-            pdf.set_font('Arial', '', 12)
-            for point in points:
-                # Clean the text of any problematic characters
-                clean_point = point.encode('ascii', 'replace').decode()
-                # Add content with dash instead of bullet
-                pdf.multi_cell(0, 10, f"- {clean_point}")
-            pdf.ln(5)
-        
-        pdf.output(output_path)
-        logging.info(f"Summary saved to {output_path}")
-        return output_path
-    except Exception as e:
-        logging.error(f"Error saving summary to PDF: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error saving summary to PDF: {str(e)}")
-def generate_graphical_abstract(summary, pipe):
-    try:
-        # Create a more focused prompt for research visualization
-        prompt = f"""Create a scientific graphical abstract visualization:
-        A clean, professional diagram showing:
-        {summary[:300]}
-        Style: Modern scientific illustration, minimalist, clear layout, professional colors
-        Include: Relevant scientific symbols, data visualization elements, and clear visual hierarchy
-        """
-        
-        negative_prompt = "text, words, blurry, low quality, distorted, messy, cluttered"
-        
-        # Generate image with improved parameters
-        output = pipe(
-            prompt=prompt,
-            negative_prompt=negative_prompt,
-            num_inference_steps=50,
-            guidance_scale=7.5,
-            height=768,
-            width=768
-        )
-        
-        if not output.images:
-            raise ValueError("No images generated")
-            
-        image = output.images[0]
-        graphical_abstract_path = os.path.join(TEMP_DIR, "graphical_abstract.png")
-        image.save(graphical_abstract_path, quality=95)
-        
-        return graphical_abstract_path
-    except Exception as e:
-        logging.error(f"Graphical Abstract Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to generate graphical abstract: {str(e)}")
-
-# AI Voiceover
-def generate_voice(summary):
-    try:
-        audio = generate(
-            text=summary,
-            voice="Lily",
-            model="eleven_monolingual_v1",
-            api_key=ELEVENLABS_API_KEY
-        )
-        voiceover_path = os.path.join(TEMP_DIR, "voiceover.mp3")
-        with open(voiceover_path, "wb") as f:
-            f.write(audio)
-        return voiceover_path
-    except Exception as e:
-        logging.error(f"Voiceover Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Voiceover Error: {str(e)}")
-
-# Generate Presentation
-def generate_presentation(summary):
-    try:
-        prs = Presentation()
-        
-        # Title slide
-        title_slide = prs.slides.add_slide(prs.slide_layouts[0])
-        title_slide.shapes.title.text = "Research Paper Summary"
-        title_slide.placeholders[1].text = "Generated Summary Presentation"
-        
-        # Summary sections
-        sections = format_summary_sections(summary)
-        for section, points in sections.items():
-            slide = prs.slides.add_slide(prs.slide_layouts[1])
-            slide.shapes.title.text = section
-            text_frame = slide.placeholders[1].text_frame
-            
-            for point in points:
-                p = text_frame.add_paragraph()
-                p.text = f"• {point}"
-                p.level = 0
-        
-        presentation_path = os.path.join(TEMP_DIR, "presentation.pptx")
-        prs.save(presentation_path)
-        return presentation_path
-    except Exception as e:
-        logging.error(f"Presentation Generation Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Presentation Generation Error: {str(e)}")
-
-# FastAPI Route
-@app.post("/process-paper/")
-async def process_paper(file: UploadFile, summary_length: str = "medium"):
-    try:
-        # Initialize Stable Diffusion
-        pipe = initialize_stable_diffusion()
-        
-        file_path = os.path.join(TEMP_DIR, "temp_paper.pdf")
-        with open(file_path, "wb") as f:
-            while chunk := file.file.read(1024 * 1024):
-                f.write(chunk)
-
-        text = extract_text_from_pdf(file_path)
-        summary = ollama_summary(text, summary_length)
-        
-        # Generate all outputs
-        summary_pdf_path = os.path.join(TEMP_DIR, "summary.pdf")
-        save_summary_to_pdf(summary, summary_pdf_path)
-        
-        graphical_abstract_path = generate_graphical_abstract(summary, pipe)
-        voiceover_path = generate_voice(summary)
-        presentation_path = generate_presentation(summary)
-
-        return {
-            "summary": summary,
-            "summary_pdf": summary_pdf_path,
-            "graphical_abstract": graphical_abstract_path,
-            "voiceover": voiceover_path,
-            "presentation": presentation_path,
-        }
-    except Exception as e:
-        logging.error(f"Error processing paper: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Run FastAPI Server
-if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8080, reload=True)
+import asyncio
+import copy
+import functools
+import hashlib
+import io
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import aiofiles
+import fitz  # PyMuPDF for PDF processing
+from fastapi import FastAPI, Request, UploadFile, HTTPException
+from fastapi import Response
+from fastapi.responses import FileResponse, ORJSONResponse
+from dotenv import load_dotenv
+from diffusers import DPMSolverMultistepScheduler, StableDiffusionXLPipeline
+from elevenlabs.client import AsyncElevenLabs
+import requests
+from pptx import Presentation
+import uvicorn
+import ollama
+import logging
+import torch
+from datetime import datetime
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.FileHandler("app.log"), logging.StreamHandler()]
+)
+
+# Load environment variables
+load_dotenv()
+
+# Create a directory for temporary files
+TEMP_DIR = "temp_files"
+os.makedirs(TEMP_DIR, exist_ok=True)
+
+# Get API keys securely
+ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
+HUGGINGFACE_API_TOKEN = os.getenv("HUGGINGFACE_API_TOKEN")
+
+# Ensure API keys are set
+if not ELEVENLABS_API_KEY or not HUGGINGFACE_API_TOKEN:
+    logging.error("API keys are not set correctly.")
+    raise ValueError("API keys are missing.")
+
+# Authenticate with Hugging Face Hub via the environment: from_pretrained
+# picks HF_TOKEN up through huggingface_hub's env fallback, whereas
+# login() rewrote the token file on disk in every worker process and
+# could race when several workers started at once
+os.environ["HF_TOKEN"] = HUGGINGFACE_API_TOKEN
+
+# Diffusers pipelines aren't safe for concurrent calls — two requests
+# denoising at once would interleave CUDA state — so every inference on
+# the shared pipeline takes this lock
+PIPE_LOCK = asyncio.Lock()
+
+# Reusable CUDA RNG for the pipeline, seeded once at startup; created
+# there rather than at import so CPU-only dev boxes can still import the
+# module
+GEN = None
+
+@asynccontextmanager
+async def lifespan(app):
+    """Build and warm the SDXL pipeline once, before serving requests."""
+    global GEN, BATCH_QUEUE
+    torch.backends.cudnn.benchmark = True
+    torch.set_float32_matmul_precision("high")
+    app.state.pipe = initialize_stable_diffusion()
+    GEN = torch.Generator(device="cuda").manual_seed(42)
+    # Warm through the batcher's own path: real inference runs batched
+    # prompt embeds at 512×512, and reduce-overhead specializes per batch
+    # size, so an eager 1024×1024 call would leave every serving shape
+    # cold. One throwaway batch per size pays the cuDNN autotune and
+    # torch.compile cost at startup instead of on user requests.
+    for batch_size in range(1, MAX_BATCH_SIZE + 1):
+        run_pipe_batch(app.state.pipe, [("warmup", "")] * batch_size)
+    # Start the micro-batching loop that owns all pipeline inference
+    BATCH_QUEUE = asyncio.Queue()
+    batcher_task = asyncio.create_task(abstract_batcher(app.state.pipe))
+    # CPU-bound document rendering (PDF layout, PPTX serialization) runs
+    # here instead of worker threads, sidestepping the GIL; two workers is
+    # enough since each request renders exactly one PDF and one PPTX
+    app.state.executor = ProcessPoolExecutor(max_workers=2)
+    logging.info("SDXL pipeline loaded and warmed up.")
+    yield
+    batcher_task.cancel()
+    app.state.executor.shutdown(wait=False)
+
+# orjson serializes the multi-KB summary strings with SIMD-accelerated
+# escaping, several times faster than the stdlib encoder
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+
+def enable_hopper_flash_attention(pipe):
+    """Route UNet attention through FlashAttention-3 FP8 kernels on Hopper.
+
+    FA3's FP8 forward roughly halves attention bandwidth again over the
+    FlashAttention-2 path SDPA dispatches to. Returns False (leaving SDPA
+    in charge) on pre-Hopper GPUs or when the flash_attn_interface build
+    isn't installed.
+    """
+    if torch.cuda.get_device_capability(0)[0] < 9:
+        return False
+    try:
+        from flash_attn_interface import flash_attn_func
+    except ImportError:
+        logging.info("FlashAttention-3 not installed; keeping SDPA attention.")
+        return False
+
+    class FlashAttn3Processor:
+        """Minimal diffusers attention processor backed by FA3's fused kernel."""
+
+        def __call__(self, attn, hidden_states, encoder_hidden_states=None,
+                     attention_mask=None, temb=None, **kwargs):
+            residual = hidden_states
+
+            if attn.spatial_norm is not None:
+                hidden_states = attn.spatial_norm(hidden_states, temb)
+
+            input_ndim = hidden_states.ndim
+            if input_ndim == 4:
+                batch, channel, height, width = hidden_states.shape
+                hidden_states = hidden_states.view(batch, channel, height * width).transpose(1, 2)
+
+            if attn.group_norm is not None:
+                hidden_states = attn.group_norm(hidden_states.transpose(1, 2)).transpose(1, 2)
+
+            if encoder_hidden_states is None:
+                encoder_hidden_states = hidden_states
+            elif attn.norm_cross:
+                encoder_hidden_states = attn.norm_encoder_hidden_states(encoder_hidden_states)
+
+            query = attn.to_q(hidden_states)
+            key = attn.to_k(encoder_hidden_states)
+            value = attn.to_v(encoder_hidden_states)
+
+            batch_size = query.shape[0]
+            head_dim = query.shape[-1] // attn.heads
+            query = query.view(batch_size, -1, attn.heads, head_dim)
+            key = key.view(batch_size, -1, attn.heads, head_dim)
+            value = value.view(batch_size, -1, attn.heads, head_dim)
+
+            # FA3 takes (batch, seqlen, heads, head_dim); FP8 inputs halve
+            # the bytes the attention kernel streams
+            out = flash_attn_func(
+                query.to(torch.float8_e4m3fn),
+                key.to(torch.float8_e4m3fn),
+                value.to(torch.float8_e4m3fn),
+            )[0]
+            hidden_states = out.to(query.dtype).reshape(batch_size, -1, attn.heads * head_dim)
+
+            hidden_states = attn.to_out[0](hidden_states)
+            hidden_states = attn.to_out[1](hidden_states)
+
+            if input_ndim == 4:
+                hidden_states = hidden_states.transpose(-1, -2).reshape(batch, channel, height, width)
+            if attn.residual_connection:
+                hidden_states = hidden_states + residual
+            return hidden_states / attn.rescale_output_factor
+
+    pipe.unet.set_attn_processor(FlashAttn3Processor())
+    return True
+
+def initialize_stable_diffusion():
+    """Initialize Stable Diffusion with optimal settings"""
+    try:
+        # Check if CUDA is available
+        if not torch.cuda.is_available():
+            raise RuntimeError("CUDA is not available. Please ensure you have a CUDA-capable GPU.")
+        
+        # Initialize the pipeline with proper settings
+        pipe = StableDiffusionXLPipeline.from_pretrained(
+            "stabilityai/stable-diffusion-xl-base-1.0",
+            torch_dtype=torch.float16,  # Ensure float16 for memory efficiency
+            use_safetensors=True,
+            variant="fp16"
+        )
+        
+        # Move to CUDA device
+        pipe = pipe.to("cuda")
+
+        # DPM-Solver++ 2M with Karras sigmas converges in ~10 steps to
+        # quality the default scheduler needs 30 for — a 3x cut in UNet
+        # forward passes per image
+        pipe.scheduler = DPMSolverMultistepScheduler.from_config(
+            pipe.scheduler.config,
+            algorithm_type="dpmsolver++",
+            use_karras_sigmas=True
+        )
+
+        # Quantize the UNet weights to int8 if optimum-quanto is available.
+        # Batch-1 SDXL is bound on streaming UNet weights from HBM, so
+        # halving weight bytes roughly halves per-step memory traffic;
+        # activations stay fp16 so quality is unaffected.
+        try:
+            from optimum.quanto import quantize, freeze, qint8
+            quantize(pipe.unet, weights=qint8)
+            freeze(pipe.unet)
+            # The larger of the two CLIP encoders is worth quantizing too;
+            # text_encoder and the VAE stay fp16
+            quantize(pipe.text_encoder_2, weights=qint8)
+            freeze(pipe.text_encoder_2)
+            logging.info("SDXL UNet and text_encoder_2 quantized to int8 weights.")
+        except ImportError:
+            logging.info("optimum-quanto not installed; keeping fp16 UNet weights.")
+        except Exception as e:
+            logging.warning(f"Could not quantize UNet, keeping fp16 weights: {e}")
+
+        # The VAE decode is the memory spike at the end of generation;
+        # tiling and slicing bound it so full-resolution output fits
+        # without falling back to smaller images
+        pipe.enable_vae_tiling()
+        pipe.enable_vae_slicing()
+
+        # On Hopper, swap UNet attention for FlashAttention-3's FP8 path
+        try:
+            if enable_hopper_flash_attention(pipe):
+                logging.info("UNet attention using FlashAttention-3 FP8 kernels.")
+        except Exception as e:
+            logging.warning(f"Could not enable FlashAttention-3, keeping SDPA: {e}")
+
+        # Everywhere else attention runs through PyTorch 2's native
+        # scaled_dot_product_attention, which dispatches to FlashAttention-2
+        # where the GPU supports it — diffusers uses it by default, so no
+        # xformers hook is needed. Keep the memory optimizations only for
+        # small GPUs (< 8GB).
+        if torch.cuda.get_device_properties(0).total_memory < 8 * (1024 ** 3):
+            pipe.enable_attention_slicing()
+            pipe.enable_sequential_cpu_offload()
+
+        # The per-step tqdm bar costs a stderr write per denoising step
+        pipe.set_progress_bar_config(disable=True)
+
+        # Compile the UNet (the hot loop of every denoising step) and the
+        # VAE decode into fused CUDA graphs; falls back to eager if
+        # compilation fails
+        try:
+            pipe.unet = torch.compile(pipe.unet, mode="reduce-overhead", fullgraph=True)
+            pipe.vae.decode = torch.compile(pipe.vae.decode)
+        except Exception as e:
+            logging.warning(f"Could not compile pipeline modules, running eager: {e}")
+
+        return pipe
+    except Exception as e:
+        logging.error(f"Error initializing Stable Diffusion: {str(e)}")
+        # Provide more specific error messages based on common issues
+        if "CUDA" in str(e):
+            raise HTTPException(
+                status_code=500,
+                detail="GPU initialization failed. Please ensure CUDA is properly installed and a compatible GPU is available."
+            )
+        elif "memory" in str(e).lower():
+            raise HTTPException(
+                status_code=500,
+                detail="Insufficient GPU memory. Try reducing batch size or image dimensions."
+            )
+        else:
+            raise HTTPException(status_code=500, detail=f"Failed to initialize Stable Diffusion: {str(e)}")
+
+@functools.lru_cache(maxsize=64)
+def encode_prompt_cached(pipe, prompt, negative_prompt):
+    """Run SDXL's two CLIP text encoders once per distinct prompt.
+
+    Repeated or similar summaries produce identical prompts, so caching the
+    embeddings means only the UNet denoise loop runs on a hit.
+    """
+    return pipe.encode_prompt(
+        prompt=prompt,
+        negative_prompt=negative_prompt,
+        device="cuda",
+        do_classifier_free_guidance=True,
+    )
+
+def encode_png(image):
+    """Encode a PIL image to PNG bytes, via libvips when it's installed.
+
+    libvips encodes tiles on multiple threads; the Pillow fallback uses
+    compress_level=1 since deflate at the default level 6 is compute-bound
+    and barely shrinks AI-generated images. Installing pillow-simd gives
+    the fallback path SIMD codec loops with no code change.
+    """
+    try:
+        import pyvips
+        vips_img = pyvips.Image.new_from_memory(
+            image.tobytes(), image.width, image.height,
+            len(image.getbands()), "uchar"
+        )
+        return vips_img.pngsave_buffer(compression=1)
+    except ImportError:
+        buf = io.BytesIO()
+        image.save(buf, format="PNG", compress_level=1)
+        return buf.getvalue()
+
+# Micro-batching for SDXL: concurrent requests enqueue (prompts, future)
+# tuples and a background task folds up to MAX_BATCH_SIZE of them into a
+# single batched UNet run, so N simultaneous papers cost roughly one
+# denoise loop instead of N serialized ones
+MAX_BATCH_SIZE = 4
+BATCH_WINDOW_SECONDS = 0.05
+BATCH_QUEUE = None  # created in lifespan so it binds to the serving loop
+
+def run_pipe_batch(pipe, prompts):
+    """Encode and denoise one batch of (prompt, negative_prompt) pairs.
+
+    Runs on a worker thread: the CLIP encoder forwards (on cache misses)
+    are GPU work too and must stay off the event loop.
+    """
+    # inference_mode skips autograd view tracking and version counters on
+    # every tensor op in the denoise loop; the persistent generator avoids
+    # re-seeding global RNG state
+    with torch.inference_mode():
+        embeds = [
+            encode_prompt_cached(pipe, prompt, negative_prompt)
+            for prompt, negative_prompt in prompts
+        ]
+        return pipe(
+            prompt_embeds=torch.cat([e[0] for e in embeds]),
+            negative_prompt_embeds=torch.cat([e[1] for e in embeds]),
+            pooled_prompt_embeds=torch.cat([e[2] for e in embeds]),
+            negative_pooled_prompt_embeds=torch.cat([e[3] for e in embeds]),
+            num_inference_steps=10,  # DPM-Solver++ needs far fewer steps
+            guidance_scale=7.5,
+            height=512,  # Reduced size for memory efficiency
+            width=512,
+            generator=GEN
+        )
+
+async def abstract_batcher(pipe):
+    """Pull queued abstract requests and serve them in micro-batches."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await BATCH_QUEUE.get()]
+        # Hold the window open briefly to let concurrent requests join
+        deadline = loop.time() + BATCH_WINDOW_SECONDS
+        while len(batch) < MAX_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(BATCH_QUEUE.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        try:
+            prompts = [(prompt, negative_prompt) for prompt, negative_prompt, _ in batch]
+            async with PIPE_LOCK:
+                output = await asyncio.to_thread(run_pipe_batch, pipe, prompts)
+            if len(output.images) != len(batch):
+                raise ValueError("No images generated")
+            for (_, _, future), image in zip(batch, output.images):
+                if not future.done():
+                    future.set_result(image)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+async def generate_graphical_abstract(summary):
+    try:
+        # Re-runs of the same paper produce the same prompt (only the
+        # first 300 chars of the summary feed it), so key the artifact by
+        # that prefix and skip the whole denoise loop on a hit
+        key = hashlib.blake2b(summary[:300].encode(), digest_size=16).hexdigest()
+        abstract_name = f"abstract_{key}.png"
+        # get() rather than `in`: a hit must refresh LRU recency so a
+        # frequently re-uploaded paper's abstract doesn't age out and 404
+        # the URL we're about to return
+        if ARTIFACTS.get(abstract_name) is not None:
+            logging.info("Graphical abstract served from cache.")
+            return abstract_name
+
+        # Create a more focused prompt for research visualization
+        prompt = f"""Create a scientific graphical abstract visualization:
+        A clean, professional diagram showing:
+        {summary[:300]}
+        Style: Modern scientific illustration, minimalist, clear layout, professional colors
+        Include: Relevant scientific symbols, data visualization elements, and clear visual hierarchy
+        """
+
+        negative_prompt = "text, words, blurry, low quality, distorted, messy, cluttered"
+
+        # Hand the prompt to the batcher and wait for our image
+        future = asyncio.get_running_loop().create_future()
+        await BATCH_QUEUE.put((prompt, negative_prompt, future))
+        try:
+            image = await future
+        except torch.cuda.OutOfMemoryError as e:
+            logging.error(f"GPU out of memory during image generation: {str(e)}")
+            raise HTTPException(
+                status_code=507,
+                detail="GPU ran out of memory generating the graphical abstract."
+            )
+
+        ARTIFACTS[abstract_name] = await asyncio.to_thread(encode_png, image)
+
+        return abstract_name
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Graphical Abstract Error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to generate graphical abstract: {str(e)}")
+
+@app.get("/")
+def read_root():
+    return {"message": "FastAPI server is running!"}
+
+class ArtifactResponse(FileResponse):
+    # Serve in 1 MiB chunks instead of starlette's 64 KiB default; fewer,
+    # larger sendfile calls keep localhost transfers near line rate
+    chunk_size = 1024 * 1024
+
+class ArtifactCache(OrderedDict):
+    """Bounded LRU mapping for in-memory artifacts.
+
+    Without a cap, content-keyed abstracts (one PNG per distinct summary)
+    and per-request artifacts accumulate for the life of the server. Reads
+    refresh recency; inserts evict the oldest entries past maxsize.
+    """
+
+    def __init__(self, maxsize=64):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return super().__getitem__(key)
+
+# Generated artifacts kept in memory, keyed by artifact name; serving from
+# here skips the disk write/read round-trip entirely
+ARTIFACTS = ArtifactCache(maxsize=64)
+
+ARTIFACT_MEDIA_TYPES = {
+    ".pdf": "application/pdf",
+    ".png": "image/png",
+    ".mp3": "audio/mpeg",
+    ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+}
+
+def artifact_url(request, path):
+    """Build the download URL the frontend can fetch for a generated file."""
+    return f"{request.base_url}artifact/{os.path.basename(path)}"
+
+@app.get("/artifact/{name}")
+def get_artifact(name: str):
+    # basename() keeps requests from escaping TEMP_DIR
+    name = os.path.basename(name)
+    media_type = ARTIFACT_MEDIA_TYPES.get(os.path.splitext(name)[1].lower())
+
+    # Prefer the in-memory copy; fall back to TEMP_DIR for artifacts that
+    # are still written to disk
+    data = ARTIFACTS.get(name)
+    if data is not None:
+        return Response(
+            content=data,
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{name}"'},
+        )
+
+    path = os.path.join(TEMP_DIR, name)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail=f"Artifact not found: {name}")
+    return ArtifactResponse(path, media_type=media_type, filename=name)
+
+# Budgets for extraction: ~12k tokens (~4 chars each) total keeps the
+# summarizer's prompt bounded, and the per-page cap stops pathological
+# pages (tables, references dumps) from eating the whole budget
+MAX_EXTRACT_CHARS = 48000
+MAX_PAGE_CHARS = 6000
+
+# Extract text from PDF
+def extract_text_from_pdf(pdf_path):
+    try:
+        # Open by path: MuPDF mmaps the file itself and demand-pages it,
+        # so only the object streams it actually touches get faulted in
+        with fitz.open(pdf_path) as probe:
+            page_count = probe.page_count
+
+        # Stream pages into a single growable buffer instead of
+        # "".join(...), which materializes every page string plus a
+        # final full-size copy. StringIO keeps peak memory at ~1x the
+        # extracted text size.
+        buf = io.StringIO()
+        total = 0
+        workers = min(os.cpu_count() or 1, 8)
+
+        # PyMuPDF Documents are not thread-safe, so each worker thread
+        # opens its own handle to the file instead of sharing one; the
+        # handles are tracked for closing once the pool is done
+        local = threading.local()
+        handles = []
+
+        def load_text(index):
+            doc = getattr(local, "doc", None)
+            if doc is None:
+                doc = local.doc = fitz.open(pdf_path)
+                handles.append(doc)
+            # Plain-text mode only; image streams are never decoded.
+            # MuPDF releases the GIL while decompressing page streams,
+            # so extraction scales across threads.
+            return doc.load_page(index).get_text("text", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+
+        # Extract one batch of pages per pool round; batching (rather
+        # than submitting every page up front) preserves the early
+        # exit once the character budget is reached
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for start in range(0, page_count, workers):
+                    batch = range(start, min(start + workers, page_count))
+                    for page_text in pool.map(load_text, batch):
+                        if not page_text.strip():
+                            # Likely a scanned page — nothing extractable
+                            continue
+                        page_text = page_text[:min(MAX_PAGE_CHARS, MAX_EXTRACT_CHARS - total)]
+                        buf.write(page_text)
+                        total += len(page_text)
+                        if total >= MAX_EXTRACT_CHARS:
+                            break
+                    if total >= MAX_EXTRACT_CHARS:
+                        break
+        finally:
+            for handle in handles:
+                handle.close()
+        return buf.getvalue()
+    except Exception as e:
+        logging.error(f"PDF Extraction Error: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"PDF Extraction Error: {str(e)}")
+
+# Keep llama2 pinned in memory between calls instead of letting Ollama
+# unload it after its default 5 minute idle window
+OLLAMA_KEEP_ALIVE = "30m"
+
+# One shared client so every generate call reuses the same keep-alive HTTP
+# connection; the long timeout covers cold model loads and big prompts
+OLLAMA = ollama.AsyncClient(timeout=600)
+
+# Optional in-process llama.cpp backend: point LLAMA_GGUF_PATH at a GGUF
+# file (e.g. llama-2-7b.Q4_K_M.gguf) to run generation inside this process
+# and skip Ollama's HTTP server and JSON serialization of multi-KB prompts.
+# Q4_K_M weights also cut the bytes streamed per generated token 4x vs fp16.
+LLM = None
+LLM_LOCK = asyncio.Lock()
+LLAMA_GGUF_PATH = os.getenv("LLAMA_GGUF_PATH")
+if LLAMA_GGUF_PATH:
+    try:
+        from llama_cpp import Llama
+        LLM = Llama(
+            model_path=LLAMA_GGUF_PATH,
+            n_ctx=8192,
+            n_gpu_layers=-1,
+            n_batch=512,
+            verbose=False
+        )
+        logging.info(f"Loaded in-process llama.cpp model from {LLAMA_GGUF_PATH}")
+    except Exception as e:
+        logging.warning(f"Could not load llama.cpp model, falling back to Ollama: {e}")
+
+async def generate_text(prompt, max_tokens=1000, json_format=False):
+    """Generate a completion in-process if a GGUF model is configured, else via Ollama."""
+    if LLM is not None:
+        # llama.cpp contexts aren't safe for concurrent calls; JSON output
+        # relies on the prompt since plain completion has no format knob
+        async with LLM_LOCK:
+            result = await asyncio.to_thread(LLM, prompt, max_tokens=max_tokens)
+        return result["choices"][0]["text"]
+    # Ollama's output-length option is num_predict — "max_tokens" is not a
+    # recognized key and was silently ignored, leaving generation unbounded
+    response = await OLLAMA.generate(
+        model="llama2",
+        prompt=prompt,
+        options={"num_predict": max_tokens, "num_ctx": 4096, "temperature": 0.3},
+        format="json" if json_format else "",
+        keep_alive=OLLAMA_KEEP_ALIVE
+    )
+    return response["response"] if "response" in response else ""
+
+# llama2's context window is 4K tokens; ~12000 chars (~3000 tokens) per
+# window leaves room for the instruction and the generated summary
+SUMMARY_WINDOW_CHARS = 12000
+
+def chunk_text(text, size=SUMMARY_WINDOW_CHARS):
+    """Split text into fixed-size windows for map-reduce summarization."""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+# Ollama Summary
+async def ollama_summary(text, summary_length="medium"):
+    try:
+        def summarize_prompt(chunk):
+            return f"Summarize the following research paper in {summary_length} length, providing key findings, methodology, conclusions, and implications: {chunk}"
+
+        # Sending the whole paper in one prompt silently truncates past
+        # llama2's 4K context; summarize windows in parallel instead and
+        # reduce the partial summaries into one
+        windows = chunk_text(text)
+        partials = await asyncio.gather(
+            *(generate_text(summarize_prompt(window)) for window in windows)
+        )
+        if len(partials) == 1:
+            summary = partials[0]
+        else:
+            # The reduce prompt must itself fit the context: four partials
+            # of up to num_predict tokens each would overflow num_ctx=4096
+            # and get silently truncated just like the original one-shot
+            # prompt, so cap the joined partials to one window
+            budget = SUMMARY_WINDOW_CHARS // len(partials)
+            joined = "\n\n".join(partial[:budget] for partial in partials)
+            summary = await generate_text(
+                f"Combine the following partial summaries of one research paper into a single coherent {summary_length} length summary with key findings, methodology, conclusions, and implications: " + joined
+            )
+        logging.info("Ollama summary generated successfully.")
+        return summary
+    except Exception as e:
+        logging.error(f"Ollama Summary Error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Ollama Summary Error: {str(e)}")
+
+SECTION_TITLES = {
+    "key_findings": "Key Findings",
+    "methodology": "Methodology",
+    "conclusions": "Conclusions",
+    "implications": "Implications",
+}
+
+async def format_summary_sections(summary):
+    """Section the summary with a single structured-output LLM call."""
+    sections = {title: [] for title in SECTION_TITLES.values()}
+
+    try:
+        # One JSON-constrained request replaces the old free-text breakdown
+        # plus up to four per-section follow-up calls
+        raw = await generate_text(
+            'Analyze this research paper summary and respond with a JSON object of the form '
+            '{"key_findings": [], "methodology": [], "conclusions": [], "implications": []}, '
+            'where each list holds 2-5 concise bullet-point strings. '
+            f'Summary to analyze: {summary}',
+            max_tokens=2000,
+            json_format=True
+        )
+        parsed = json.loads(raw)
+        for key, title in SECTION_TITLES.items():
+            points = parsed.get(key) or []
+            sections[title] = [str(point).strip() for point in points if str(point).strip()]
+
+        # Ensure each section has at least some content
+        for title in sections:
+            if not sections[title]:
+                section_content = await generate_text(
+                    f"Based on this summary, provide 2-3 points specifically for the {title} section: {summary}",
+                    max_tokens=500
+                )
+                for line in section_content.split('\n'):
+                    line = line.strip()
+                    if line and not line.upper().endswith(':'):
+                        sections[title].append(line.lstrip('- •'))
+
+    except Exception as e:
+        logging.error(f"Error in format_summary_sections: {str(e)}")
+        # Fallback: generate content for each section independently
+        for title in sections:
+            try:
+                section_content = await generate_text(
+                    f"Provide 2-3 key points for the {title} section based on this summary: {summary}",
+                    max_tokens=500
+                )
+                for line in section_content.split('\n'):
+                    line = line.strip()
+                    if line and not line.upper().endswith(':'):
+                        sections[title].append(line.lstrip('- •'))
+            except Exception:
+                sections[title].append("Content generation failed for this section")
+
+    return sections
+
+def render_summary_pdf(sections):
+    """Render the sectioned summary to PDF bytes.
+
+    Pure function of its input so it can run on the process pool; the
+    caller owns storing the bytes in the artifact cache.
+    """
+    doc = fitz.open()
+    try:
+        margin = 72
+        footer = f'Generated on {datetime.now().strftime("%Y-%m-%d %H:%M")}'
+
+        def new_page():
+            page = doc.new_page()
+            page.insert_textbox(
+                fitz.Rect(margin, 40, page.rect.width - margin, 70),
+                'Research Paper Summary',
+                fontname='hebo', fontsize=15, align=fitz.TEXT_ALIGN_CENTER
+            )
+            page.insert_textbox(
+                fitz.Rect(margin, page.rect.height - 40, page.rect.width - margin, page.rect.height - 20),
+                f'{footer} - Page {doc.page_count}',
+                fontname='heit', fontsize=8, align=fitz.TEXT_ALIGN_CENTER
+            )
+            return page, 90.0
+
+        page, y = new_page()
+
+        # insert_textbox writes nothing and returns a negative leftover if
+        # the rect is too short, so size the header box off the font's line
+        # height rather than eyeballing it
+        header_height = 14 * 1.7
+
+        for section, points in sections.items():
+            if y + header_height > page.rect.height - 150:
+                page, y = new_page()
+
+            # Section header
+            page.insert_textbox(
+                fitz.Rect(margin, y, page.rect.width - margin, y + header_height),
+                section, fontname='hebo', fontsize=14
+            )
+            y += header_height + 4
+
+            # Insert one bullet per textbox; a bullet that doesn't fit in
+            # the space left on this page moves whole to the next, so long
+            # sections flow across pages instead of being dropped
+            for point in points:
+                # A full page holds ~3500 chars at 12pt; pre-split anything
+                # bigger so every piece is guaranteed to fit a fresh page
+                for piece in chunk_text(f"- {point}", size=2000):
+                    while True:
+                        rect = fitz.Rect(margin, y, page.rect.width - margin, page.rect.height - 50)
+                        leftover = page.insert_textbox(rect, piece, fontname='helv', fontsize=12)
+                        if leftover >= 0:
+                            y = rect.y1 - leftover + 4
+                            break
+                        page, y = new_page()
+            y += 8
+
+        # Render straight to bytes; the artifact endpoint serves from memory
+        return doc.tobytes(garbage=4, deflate=True)
+    finally:
+        doc.close()
+
+# AI Voiceover — requirements pin the v2 SDK, whose async client exposes
+# text_to_speech.convert; the v0-era module-level generate() no longer exists
+ELEVEN_CLIENT = AsyncElevenLabs(api_key=ELEVENLABS_API_KEY)
+
+# v1+ SDKs take a voice id rather than a display name; this is the
+# prebuilt "Lily" voice
+LILY_VOICE_ID = "pFZP5JQG7iQjIQuC4Bku"
+
+async def generate_voice_async(summary, name):
+    """Stream the voiceover from ElevenLabs while synthesis is still running."""
+    try:
+        chunks = []
+        # convert() returns an async iterator, so chunks arrive here while
+        # the rest of the audio is still being synthesized server-side
+        audio = ELEVEN_CLIENT.text_to_speech.convert(
+            voice_id=LILY_VOICE_ID,
+            text=summary,
+            model_id="eleven_monolingual_v1",
+        )
+        async for chunk in audio:
+            chunks.append(chunk)
+        ARTIFACTS[name] = b"".join(chunks)
+        return name
+    except Exception as e:
+        logging.error(f"Voiceover Error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Voiceover Error: {str(e)}")
+
+# Parse python-pptx's default template once at import; Presentation()
+# re-reads and re-parses the bundled .pptx (lxml work) on every call
+PPTX_TEMPLATE = Presentation()
+
+# Generate Presentation
+def render_presentation(sections):
+    """Render the presentation to PPTX bytes.
+
+    Like render_summary_pdf, this stays a pure function so it is
+    picklable and safe to ship to a process-pool worker.
+    """
+    prs = copy.deepcopy(PPTX_TEMPLATE)
+
+    # Title slide
+    title_slide = prs.slides.add_slide(prs.slide_layouts[0])
+    title_slide.shapes.title.text = "Research Paper Summary"
+    title_slide.placeholders[1].text = "Generated Summary Presentation"
+
+    # Summary sections
+    for section, points in sections.items():
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = section
+        text_frame = slide.placeholders[1].text_frame
+
+        for point in points:
+            p = text_frame.add_paragraph()
+            p.text = f"• {point}"
+            p.level = 0
+
+    # Presentation.save accepts a file-like object, so build the PPTX
+    # in memory and hand the bytes back to the caller
+    buf = io.BytesIO()
+    prs.save(buf)
+    return buf.getvalue()
+
+# FastAPI Route
+@app.post("/process-paper/")
+async def process_paper(request: Request, file: UploadFile, summary_length: str = "medium"):
+    try:
+        # One id per request; a fixed temp filename would let two
+        # concurrent uploads interleave writes into the same file
+        job_id = uuid.uuid4().hex
+        file_path = os.path.join(TEMP_DIR, f"upload_{job_id}.pdf")
+        # Write through the async file API so a slow upload doesn't block
+        # the event loop and serialize concurrent requests; 4 MiB chunks
+        # keep the syscall count low
+        async with aiofiles.open(file_path, "wb") as f:
+            while chunk := await file.read(4 * 1024 * 1024):
+                await f.write(chunk)
+
+        try:
+            # Extraction is CPU-bound for seconds on a big paper; run it in
+            # a worker thread so the event loop stays free for other requests
+            text = await asyncio.to_thread(extract_text_from_pdf, file_path)
+        finally:
+            # The upload is only needed for extraction; unique names would
+            # otherwise pile up in TEMP_DIR
+            os.remove(file_path)
+        summary = await ollama_summary(text, summary_length)
+
+        # Kick off synthesis as soon as the summary exists so the
+        # ElevenLabs round-trip overlaps sectioning and the other stages.
+        # Artifacts are keyed by the request's job_id; constant names let
+        # simultaneous requests overwrite — and download — each other's
+        # files (the graphical abstract is content-keyed and shared by
+        # design, so it keeps its hash name)
+        voiceover_name = f"voiceover_{job_id}.mp3"
+        voice_task = asyncio.create_task(generate_voice_async(summary, voiceover_name))
+
+        # Section the summary once; the PDF and the presentation both
+        # consume the same parsed dict instead of re-sectioning
+        sections = await format_summary_sections(summary)
+
+        # The four generators only depend on the summary/sections, so run
+        # them all concurrently: SDXL sits on the GPU, ElevenLabs waits on
+        # the network, and the PDF/PPTX renderers run in the process pool
+        # where their layout work can't contend with the event loop for
+        # the GIL. Wall-clock drops from the sum of the stages to the
+        # slowest one.
+        loop = asyncio.get_running_loop()
+        graphical_abstract_name, _, pdf_bytes, pptx_bytes = await asyncio.gather(
+            generate_graphical_abstract(summary),
+            voice_task,
+            loop.run_in_executor(request.app.state.executor, render_summary_pdf, sections),
+            loop.run_in_executor(request.app.state.executor, render_presentation, sections),
+        )
+        summary_pdf_name = f"summary_{job_id}.pdf"
+        presentation_name = f"presentation_{job_id}.pptx"
+        ARTIFACTS[summary_pdf_name] = pdf_bytes
+        ARTIFACTS[presentation_name] = pptx_bytes
+
+        # Return fetchable URLs rather than server-local paths; the
+        # frontend downloads each artifact from /artifact/{name}
+        return {
+            "summary": summary,
+            "summary_pdf": artifact_url(request, summary_pdf_name),
+            "graphical_abstract": artifact_url(request, graphical_abstract_name),
+            "voiceover": artifact_url(request, voiceover_name),
+            "presentation": artifact_url(request, presentation_name),
+        }
+    except Exception as e:
+        logging.error(f"Error processing paper: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Run FastAPI Server
+if __name__ == "__main__":
+    # reload=True forks a file watcher and reloads the whole process
+    # (including the SDXL pipeline) on any source change — dev only.
+    # Each worker loads its own pipeline, so size WEB_CONCURRENCY to the
+    # number of pipeline copies the GPU can hold.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8080,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1"))
+    )
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# main.py lives at the repo root and validates its API keys at import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ELEVENLABS_API_KEY", "test-key")
+os.environ.setdefault("HUGGINGFACE_API_TOKEN", "test-token")
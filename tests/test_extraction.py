@@ -0,0 +1,15 @@
+import fitz
+
+from main import extract_text_from_pdf
+
+
+def test_extracts_text_from_one_page_pdf(tmp_path):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "hello extraction")
+    pdf_path = str(tmp_path / "one_page.pdf")
+    doc.save(pdf_path)
+    doc.close()
+
+    text = extract_text_from_pdf(pdf_path)
+    assert "hello extraction" in text